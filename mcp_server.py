@@ -15,16 +15,20 @@ mcp = FastMCP("iMessage Analysis Server")
 analyzer = None
 
 def get_analyzer():
-    """Get or create the message analyzer instance"""
+    """Get or create the message analyzer, reloading if chat.db changed"""
     global analyzer
     if analyzer is None:
         analyzer = MessageAnalyzer()
         success = analyzer.fetch_messages()
-        if not success:
-            # The fetch_messages method already includes fallback logic
-            # If it still fails, check if we have any messages loaded
-            if not analyzer.messages:
-                raise Exception("Failed to fetch messages. Check Full Disk Access permissions.")
+    else:
+        # Cheap mtime check; keeps messages and cached results unless new
+        # messages have arrived since the last load
+        success = analyzer.refresh_messages()
+    if not success:
+        # fetch_messages reports its own errors; only fail hard if
+        # nothing at all was loaded
+        if not analyzer.messages:
+            raise Exception("Failed to fetch messages. Check Full Disk Access permissions.")
     return analyzer
 
 @mcp.tool()
@@ -54,7 +58,7 @@ def get_word_frequency(top_n: int = 10) -> dict:
     """
     try:
         analyzer = get_analyzer()
-        return dict(list(analyzer.word_frequency().items())[:top_n])
+        return analyzer.word_frequency(top_n=top_n)
     except Exception as e:
         return {"error": str(e)}
 
@@ -88,20 +92,7 @@ def list_contacts(limit: int = 20) -> list:
     """
     try:
         analyzer = get_analyzer()
-        
-        # Count messages by contact
-        contact_counts = {}
-        for msg in analyzer.messages:
-            contact = analyzer._format_phone_number(msg.get('handle_id', 'Unknown'))
-            contact_counts[contact] = contact_counts.get(contact, 0) + 1
-        
-        # Sort by message count
-        sorted_contacts = sorted(contact_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        return [
-            {"contact": contact, "message_count": count}
-            for contact, count in sorted_contacts[:limit]
-        ]
+        return analyzer.list_contacts(limit)
     except Exception as e:
         return [{"error": str(e)}]
 
@@ -119,24 +110,7 @@ def search_messages(query: str, limit: int = 10) -> list:
     """
     try:
         analyzer = get_analyzer()
-        
-        results = []
-        query_lower = query.lower()
-        
-        for msg in analyzer.messages:
-            text = msg.get('text', '')
-            if text and query_lower in text.lower():
-                results.append({
-                    'sender': analyzer._format_phone_number(msg.get('handle_id', 'Unknown')),
-                    'text': text,
-                    'date': msg.get('date', ''),
-                    'is_from_me': msg.get('is_from_me', False)
-                })
-                
-                if len(results) >= limit:
-                    break
-        
-        return results
+        return analyzer.search_messages(query, limit)
     except Exception as e:
         return [{"error": str(e)}]
 
@@ -153,33 +127,7 @@ def get_contact_statistics(contact: str) -> dict:
     """
     try:
         analyzer = get_analyzer()
-        
-        # Find messages for this contact
-        contact_messages = [
-            msg for msg in analyzer.messages
-            if analyzer._format_phone_number(msg.get('handle_id', '')) == contact
-        ]
-        
-        if not contact_messages:
-            return {"error": f"No messages found for contact: {contact}"}
-        
-        # Calculate statistics
-        total_messages = len(contact_messages)
-        my_messages = sum(1 for msg in contact_messages if msg.get('is_from_me', False))
-        their_messages = total_messages - my_messages
-        
-        avg_length = sum(len(msg.get('text', '')) for msg in contact_messages) / total_messages
-        
-        return {
-            'contact': contact,
-            'total_messages': total_messages,
-            'my_messages': my_messages,
-            'their_messages': their_messages,
-            'my_percentage': round((my_messages / total_messages) * 100, 1),
-            'their_percentage': round((their_messages / total_messages) * 100, 1),
-            'average_message_length': round(avg_length, 1),
-            'who_talks_more': 'Me' if my_messages > their_messages else 'Them' if their_messages > my_messages else 'Equal'
-        }
+        return analyzer.contact_statistics(contact)
     except Exception as e:
         return {"error": str(e)}
 
@@ -1,14 +1,90 @@
-from imessage_reader import fetch_data
-from collections import Counter
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache, wraps
+from heapq import nlargest
+from operator import itemgetter
+from pathlib import Path
+import numpy as np
+import inspect
 import json
+import sqlite3
 import os
+import re
 import sys
 import platform
 
+# macOS version, looked up once (mac_ver() may shell out to sw_vers)
+_MAC_VER = platform.mac_ver()[0]
+
+# Words of 3+ letters; ASCII and typographic (U+2019, iOS smart
+# punctuation) apostrophes are kept inside words, e.g. "don't"/"don’t"
+_WORD_RE = re.compile(r"(?:[^\W\d_]|['\u2019]){3,}")
+# Attachment/reaction artifacts, matched in a single regex scan
+_ATTACHMENT_PATTERNS = ['<message', 'attachment.>', 'text,', 'attachment', 'shared', 'location']
+_ATTACHMENT_RE = re.compile('|'.join(re.escape(pattern) for pattern in _ATTACHMENT_PATTERNS))
+
+# Stand-in text for messages without a body (attachments, reactions, ...)
+_PLACEHOLDER_TEXT = '[attachment/reaction]'
+
+class Message:
+    """A single iMessage record; slots keep per-message memory small"""
+    __slots__ = ('handle_id', 'text', 'date', 'service', 'account', 'is_from_me')
+    
+    def __init__(self, handle_id, text, date, service, account, is_from_me):
+        self.handle_id = handle_id
+        self.text = text
+        self.date = date
+        self.service = service
+        self.account = account
+        self.is_from_me = is_from_me
+
+def cached_method(method):
+    """
+    Cache a method's result on the analyzer until messages are reloaded
+    
+    Calls are keyed on their bound arguments with defaults applied, so
+    f(), f(10) and f(top_n=10) share one entry. The cached object itself is
+    returned to every caller and must be treated as read-only.
+    """
+    signature = inspect.signature(method)
+    
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        key = (method.__name__, tuple(bound.arguments.items())[1:])
+        if key not in self._cache:
+            self._cache[key] = method(self, *args, **kwargs)
+        return self._cache[key]
+    return wrapper
+
 class MessageAnalyzer:
+    # Rows pulled from SQLite per fetchmany() call
+    FETCH_CHUNK_SIZE = 2048
+    # Most recent messages loaded (and aggregated by _sql_basic_stats)
+    MESSAGE_LIMIT = 10000
+    
     def __init__(self, db_path=None):
         self.messages = []
+        # Columnar (SoA) views of self.messages, built once per fetch
+        self._handles = np.empty(0, dtype=object)
+        self._text_lens = np.empty(0, dtype=np.int32)
+        self._is_from_me = np.empty(0, dtype=bool)
+        self._dates = np.empty(0, dtype=np.int64)
+        self._formatted_handles = np.empty(0, dtype=object)
+        # Formatted contact -> indices into self.messages
+        self._by_contact = {}
+        # Lowered raw handle / formatted contact -> formatted contact
+        self._contact_norm = {}
+        # In-memory FTS5 index over message text, built on first search
+        # (False if this SQLite build lacks FTS5 trigram support)
+        self._search_index = None
+        # Analysis results keyed by (method, args); see cached_method
+        self._cache = {}
+        # Database modification time as of the last fetch
+        self._loaded_mtime = None
+        # Whether the last fetch skipped non-text messages in SQL
+        self._text_only = False
         # Default macOS path
         if db_path is None:
             home = os.path.expanduser("~")
@@ -22,7 +98,7 @@ class MessageAnalyzer:
             raise Exception("This tool only works on macOS")
         
         # Check macOS version (10.14+ required)
-        macos_version = platform.mac_ver()[0]
+        macos_version = _MAC_VER
         if macos_version:
             major, minor = map(int, macos_version.split('.')[:2])
             if major < 10 or (major == 10 and minor < 14):
@@ -33,10 +109,25 @@ class MessageAnalyzer:
         if not os.path.exists(self.db_path):
             raise Exception(f"iMessage database not found at {self.db_path}")
         
+        # A caller that already probed Full Disk Access (e.g. a setup
+        # script) can skip the second read of chat.db
+        if os.environ.get('IMESSAGE_SKIP_FDA') == '1':
+            return
+        
         try:
-            # Try to read the database file
-            with open(self.db_path, 'rb') as f:
-                f.read(1)  # Just try to read 1 byte
+            # Cheap permission check first; Full Disk Access denials only
+            # show up on an actual read, so follow with a 1-byte probe
+            if not os.access(self.db_path, os.R_OK):
+                raise PermissionError(self.db_path)
+            fd = os.open(self.db_path, os.O_RDONLY | os.O_NONBLOCK)
+            try:
+                # Unbuffered single-byte read with readahead disabled where
+                # supported, so the probe doesn't pull in pages of chat.db
+                if hasattr(os, 'posix_fadvise'):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_RANDOM)
+                os.pread(fd, 1, 0)
+            finally:
+                os.close(fd)
         except PermissionError:
             raise Exception(
                 "Permission denied accessing iMessage database. "
@@ -46,7 +137,9 @@ class MessageAnalyzer:
         except Exception as e:
             raise Exception(f"Cannot access iMessage database: {e}")
     
-    def _format_phone_number(self, handle_id):
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _format_phone_number(handle_id):
         """Format phone number for better display"""
         if not handle_id or handle_id == 'Unknown':
             return 'Unknown'
@@ -64,81 +157,108 @@ class MessageAnalyzer:
         else:
             return handle_id  # Probably already formatted or contact name
     
-    def fetch_messages(self):
-        """Fetch iMessage data using imessage_reader"""
-        try:
-            # Catch SystemExit specifically
-            import sys
-            original_exit = sys.exit
-            
-            def safe_exit(code=0):
-                raise RuntimeError(f"Library tried to exit with code: {code}")
-            
-            sys.exit = safe_exit
-            
+    def _connect(self):
+        """Open a read-only connection to the iMessage database"""
+        # Read-only so we never modify the Messages app's own database;
+        # as_uri() percent-encodes '#', '?' and '%' so the path can't leak
+        # into (or truncate) the URI query string
+        uri = Path(self.db_path).resolve().as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True)
+        # Decode TEXT with errors='replace' so one invalid UTF-8 message
+        # can't abort the whole read (the default str factory raises). This
+        # runs in Python for every TEXT cell, so it is a robustness choice,
+        # not a speedup. Queries CAST message text to TEXT so BLOB-typed
+        # bodies go through this factory too rather than surfacing as bytes
+        conn.text_factory = lambda b: b.decode('utf-8', errors='replace')
+        # Connection-local tuning: larger page cache, in-memory temp
+        # B-trees for ORDER BY/GROUP BY, and memory-mapped reads
+        conn.execute("PRAGMA cache_size = -65536")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA mmap_size = 268435456")
+        return conn
+    
+    def _build_columns(self):
+        """Build columnar arrays and the contact index from self.messages"""
+        count = len(self.messages)
+        self._handles = np.array([msg.handle_id or 'Unknown' for msg in self.messages], dtype=object)
+        self._text_lens = np.fromiter((len(msg.text or '') for msg in self.messages),
+                                      dtype=np.int32, count=count)
+        self._is_from_me = np.fromiter((bool(msg.is_from_me) for msg in self.messages),
+                                       dtype=bool, count=count)
+        self._dates = np.fromiter((msg.date or 0 for msg in self.messages),
+                                  dtype=np.int64, count=count)
+        
+        # Format each distinct handle once and broadcast back to all rows
+        unique_handles, inverse = np.unique(self._handles, return_inverse=True)
+        formatted = np.array([self._format_phone_number(h) for h in unique_handles], dtype=object)
+        self._formatted_handles = formatted[inverse.reshape(-1)]
+        
+        by_contact = defaultdict(list)
+        for i, contact in enumerate(self._formatted_handles):
+            by_contact[contact].append(i)
+        self._by_contact = dict(by_contact)
+        
+        # Both the raw handle and its display form are matchable keys
+        self._contact_norm = {}
+        for handle_id, contact in zip(unique_handles, formatted):
+            self._contact_norm[handle_id.lower()] = contact
+            self._contact_norm[contact.lower()] = contact
+        
+        # Any cached analysis or index was built from the previous message set
+        self._cache.clear()
+        self._search_index = None
+    
+    def _db_mtime(self):
+        """Latest modification time of chat.db and its WAL, or None if missing"""
+        # Messages.app writes through the WAL, so chat.db alone can look stale
+        mtimes = []
+        for path in (self.db_path, f"{self.db_path}-wal"):
             try:
-                # Validate system and database access
-                self._validate_system()
-                self._validate_database_access()
-                
-                # Create FetchData instance with path to chat.db
-                fd = fetch_data.FetchData(self.db_path)
-                
-                # Get messages using the correct method
-                try:
-                    raw_messages = fd.get_messages()
-                except Exception as e:
-                    print(f"Error fetching messages: {e}")
-                    # Don't return False here - let it fall through to exception handling
-                    raise e
-                
-                if not raw_messages:
-                    print("⚠️  No messages found in database")
-                    return True  # Not an error, just empty
-                
-                # Convert tuples to dictionaries for easier processing
-                self.messages = []
-                for msg in raw_messages:
-                    # Handle different tuple formats gracefully
-                    message_dict = {
-                        'handle_id': msg[0] if len(msg) > 0 else 'Unknown',
-                        'text': msg[1] if len(msg) > 1 else '',
-                        'date': msg[2] if len(msg) > 2 else None,
-                        'service': msg[3] if len(msg) > 3 else 'Unknown',
-                        'account': msg[4] if len(msg) > 4 else 'Unknown',
-                        'is_from_me': msg[5] if len(msg) > 5 else False,
-                    }
-                    
-                    # Only add messages with actual content
-                    if message_dict['text'] or message_dict['handle_id'] != 'Unknown':
-                        self.messages.append(message_dict)
-                
-                print(f"✅ Loaded {len(self.messages)} messages from {len(set(msg.get('handle_id', 'Unknown') for msg in self.messages))} contacts")
-                return True
-            finally:
-                sys.exit = original_exit
-        except (RuntimeError, SystemExit) as e:
-            print(f"⚠️ Database reading failed: {e}")
-            print("Trying alternative approach...")
-            return self._fallback_message_reading()
-        except UnicodeDecodeError as e:
-            print(f"⚠️ UTF-8 decoding error: {e}")
-            print("Trying alternative approach...")
-            return self._fallback_message_reading()
+                mtimes.append(os.stat(path).st_mtime_ns)
+            except OSError:
+                continue
+        return max(mtimes) if mtimes else None
+    
+    def fetch_messages(self, text_only=False):
+        """
+        Fetch iMessage data directly from chat.db
+        
+        Args:
+            text_only (bool): Skip attachments, reactions and other non-text
+                messages in SQL; for text-analysis pipelines (default: False)
+        """
+        # Taken before reading so writes during the fetch trigger a reload
+        mtime = self._db_mtime()
+        try:
+            # Validate system and database access
+            self._validate_system()
+            self._validate_database_access()
         except Exception as e:
-            print(f"⚠️ Unexpected error: {e}")
-            print("Trying alternative approach...")
-            return self._fallback_message_reading()
+            print(f"❌ {e}")
+            return False
+        
+        success = self._read_via_sqlite(text_only)
+        if success:
+            # Only a completed load counts; a failed one is retried next refresh
+            self._loaded_mtime = mtime
+            self._text_only = text_only
+        return success
     
-    def _fallback_message_reading(self):
-        """Fallback method using direct SQLite access with better error handling"""
+    def _read_via_sqlite(self, text_only=False):
+        """
+        Read messages using direct SQLite access with error handling
+        
+        self.messages and its indexes are only replaced once the whole read
+        has succeeded; on error the previous load is left intact.
+        """
         try:
-            import sqlite3
-            
-            print("🔄 Attempting direct SQLite access...")
-            
             # Connect to database with error handling
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
+        except Exception as e:
+            print(f"❌ Reading messages failed: {e}")
+            return False
+        
+        try:
             cursor = conn.cursor()
             
             # Try a simple query first to test access
@@ -148,74 +268,92 @@ class MessageAnalyzer:
             
             if total_count == 0:
                 print("⚠️  Database is empty")
-                conn.close()
+                self.messages = []
+                self._build_columns()
                 return True
             
             # Get messages with simplified query - include ALL message types
-            query = """
+            # unless text_only asks SQLite to drop attachment artifacts
+            where = ""
+            params = []
+            if text_only:
+                where = "WHERE m.text IS NOT NULL AND " + " AND ".join(
+                    "m.text NOT LIKE ?" for _ in _ATTACHMENT_PATTERNS
+                )
+                params = [f"%{pattern}%" for pattern in _ATTACHMENT_PATTERNS]
+            
+            query = f"""
             SELECT 
                 h.id,
-                m.text,
+                CAST(m.text AS TEXT),
                 m.date,
                 m.service,
                 m.account,
                 m.is_from_me
             FROM message m
             LEFT JOIN handle h ON m.handle_id = h.ROWID
+            {where}
             ORDER BY m.date DESC
-            LIMIT 10000
+            LIMIT ?
             """
             
-            cursor.execute(query)
-            rows = cursor.fetchall()
+            cursor.execute(query, [*params, self.MESSAGE_LIMIT])
             
-            self.messages = []
-            for row in rows:
-                try:
-                    # Handle potential encoding issues in text
-                    text = row[1] if row[1] else ''
-                    if isinstance(text, bytes):
-                        # Try different encodings
-                        try:
-                            text = text.decode('utf-8')
-                        except UnicodeDecodeError:
-                            try:
-                                text = text.decode('latin-1')
-                            except UnicodeDecodeError:
-                                text = text.decode('utf-8', errors='replace')
-                    
-                    message_dict = {
-                        'handle_id': row[0] or 'Unknown',
-                        'text': text or '[attachment/reaction]',
-                        'date': row[2],
-                        'service': row[3] or 'Unknown',
-                        'account': row[4] or 'Unknown',
-                        'is_from_me': bool(row[5]),
-                    }
-                    
-                    # Include ALL messages (text, attachments, reactions, etc.)
-                    if message_dict['handle_id'] != 'Unknown':
-                        self.messages.append(message_dict)
+            # Stream rows in chunks rather than materializing every tuple at once
+            messages = []
+            while True:
+                rows = cursor.fetchmany(self.FETCH_CHUNK_SIZE)
+                if not rows:
+                    break
+                
+                for row in rows:
+                    try:
+                        message = Message(
+                            handle_id=row[0] or 'Unknown',
+                            text=row[1] or _PLACEHOLDER_TEXT,
+                            date=row[2],
+                            service=row[3] or 'Unknown',
+                            account=row[4] or 'Unknown',
+                            is_from_me=bool(row[5]),
+                        )
                         
-                except Exception as e:
-                    # Skip problematic messages but continue
-                    print(f"⚠️  Skipping message due to error: {e}")
-                    continue
+                        # Include ALL messages (text, attachments, reactions, etc.)
+                        if message.handle_id != 'Unknown':
+                            messages.append(message)
+                            
+                    except Exception as e:
+                        # Skip problematic messages but continue
+                        print(f"⚠️  Skipping message due to error: {e}")
+                        continue
             
-            conn.close()
+            # The read completed - swap in the new messages and rebuild indexes
+            self.messages = messages
+            self._build_columns()
             
             if self.messages:
-                unique_contacts = len(set(msg.get('handle_id', 'Unknown') for msg in self.messages))
-                print(f"✅ Loaded {len(self.messages)} messages from {unique_contacts} contacts (fallback method)")
+                unique_contacts = len(set(msg.handle_id for msg in self.messages))
+                print(f"✅ Loaded {len(self.messages)} messages from {unique_contacts} contacts")
                 return True
             else:
                 print("⚠️  No valid messages found")
                 return False
                 
         except Exception as e:
-            print(f"❌ Fallback method also failed: {e}")
+            print(f"❌ Reading messages failed: {e}")
             return False
+        finally:
+            conn.close()
 
+    def refresh_messages(self):
+        """Reload messages if the database changed, discarding cached results"""
+        mtime = self._db_mtime()
+        if self.messages and mtime is not None and mtime == self._loaded_mtime:
+            # Nothing new on disk - keep the loaded messages, indexes and cache
+            return True
+        
+        self._cache.clear()
+        return self.fetch_messages(self._text_only)
+    
     def fetch_messages_with_recovery(self):
         try:
             return self._fetch_all_messages()
@@ -224,56 +362,110 @@ class MessageAnalyzer:
             print("Attempting partial recovery...")
             return self._fetch_recent_messages_only()
     
+    def _sql_basic_stats(self):
+        """
+        Compute basic statistics with a single GROUP BY query in SQLite
+        
+        Applies the same rules as _read_via_sqlite (default mode): the
+        MESSAGE_LIMIT most recent messages, rows without a handle dropped,
+        and empty text counted as the attachment/reaction placeholder.
+        """
+        query = """
+        SELECT
+            id,
+            COUNT(*),
+            TOTAL(LENGTH(text)),
+            MAX(LENGTH(text))
+        FROM (
+            SELECT
+                h.id AS id,
+                COALESCE(NULLIF(CAST(m.text AS TEXT), ''), ?) AS text
+            FROM message m
+            LEFT JOIN handle h ON m.handle_id = h.ROWID
+            ORDER BY m.date DESC
+            LIMIT ?
+        )
+        WHERE id IS NOT NULL AND id NOT IN ('', 'Unknown')
+        GROUP BY id
+        """
+        
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(query, (_PLACEHOLDER_TEXT, self.MESSAGE_LIMIT)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            return {"error": f"Cannot read iMessage database: {e}"}
+        
+        if not rows:
+            return {"error": "No messages loaded"}
+        
+        senders = Counter()
+        total_chars = 0
+        longest = 0
+        for handle_id, count, chars, max_len in rows:
+            senders[self._format_phone_number(handle_id)] += count
+            total_chars += chars
+            longest = max(longest, max_len or 0)
+        
+        total_messages = sum(senders.values())
+        return {
+            "total_messages": total_messages,
+            "unique_senders": len(senders),
+            "top_senders": dict(senders.most_common(5)),
+            "avg_message_length": total_chars / total_messages,
+            "longest_message": int(longest)
+        }
+    
+    @cached_method
     def basic_stats(self):
         """Generate basic statistics about messages"""
         if not self.messages:
-            return {"error": "No messages loaded"}
+            # Nothing fetched yet - let SQLite aggregate instead of loading rows
+            return self._sql_basic_stats()
         
         total_messages = len(self.messages)
         
-        # Count messages by sender
+        # Count messages per raw handle in one vectorized pass, then format
+        # only the distinct handles (#contacts << #messages)
+        handles, counts = np.unique(self._handles, return_counts=True)
         senders = Counter()
-        message_lengths = []
+        for handle, count in zip(handles, counts.tolist()):
+            senders[self._format_phone_number(handle)] += count
         
-        for msg in self.messages:
-            sender = self._format_phone_number(msg.get('handle_id', 'Unknown'))
-            senders[sender] += 1
-            
-            text = msg.get('text', '')
-            if text:
-                message_lengths.append(len(text))
+        # Only non-empty messages contribute to length statistics
+        message_lengths = self._text_lens[self._text_lens > 0]
         
         stats = {
             "total_messages": total_messages,
             "unique_senders": len(senders),
             "top_senders": dict(senders.most_common(5)),
-            "avg_message_length": sum(message_lengths) / len(message_lengths) if message_lengths else 0,
-            "longest_message": max(message_lengths) if message_lengths else 0
+            "avg_message_length": float(message_lengths.mean()) if message_lengths.size else 0,
+            "longest_message": int(message_lengths.max()) if message_lengths.size else 0
         }
         
         return stats
     
+    @cached_method
     def word_frequency(self, top_n=10):
         """Analyze word frequency across all messages"""
         if not self.messages:
             return {"error": "No messages loaded"}
         
-        all_words = []
-        # Attachment patterns to filter out
-        attachment_patterns = ['<message', 'attachment.>', 'text,', 'attachment', 'shared', 'location']
         # Common stop words to filter
         stop_words = {'the', 'and', 'but', 'with', 'for', 'you', 'are', 'was', 'this', 'that', 'have', 'had'}
         
-        for msg in self.messages:
-            text = msg.get('text', '')
-            if text and not any(pattern in text.lower() for pattern in attachment_patterns):
-                # Simple word splitting and cleaning
-                words = text.lower().replace(',', '').replace('.', '').replace('!', '').replace('?', '').split()
-                # Filter out short words, stop words, and attachment artifacts
-                words = [word for word in words if len(word) > 2 and word not in stop_words]
-                all_words.extend(words)
+        # Lower each message once and drop attachment/reaction artifacts
+        texts = (msg.text or '' for msg in self.messages)
+        kept = [text for text in map(str.lower, texts) if text and not _ATTACHMENT_RE.search(text)]
+        
+        # Tokenize the whole corpus in a single regex pass and count in C;
+        # newline separators can't be part of a word, so messages stay apart
+        word_counter = Counter(_WORD_RE.findall('\n'.join(kept)))
+        for word in stop_words:
+            word_counter.pop(word, None)
         
-        word_counter = Counter(all_words)
         return dict(word_counter.most_common(top_n))
     
     def export_stats(self, filename="message_stats.json"):
@@ -291,77 +483,52 @@ class MessageAnalyzer:
         print(f"📊 Stats exported to {filename}")
         return stats
     
+    @cached_method
     def conversation_analysis(self):
         """Analyze conversations grouped by sender"""
         if not self.messages:
             return {"error": "No messages loaded"}
         
-        # Group messages by sender
+        # Aggregate each sender's slice of the columnar arrays; lengths and
+        # counts are int32/bool array reductions rather than Python sums
         conversations = {}
         
-        for msg in self.messages:
-            sender = self._format_phone_number(msg.get('handle_id', 'Unknown'))
-            text = msg.get('text', '')
-            is_from_me = msg.get('is_from_me', False)
-            date = msg.get('date', None)
-            
-            if sender not in conversations:
-                conversations[sender] = {
-                    'messages': [],
-                    'total_count': 0,
-                    'my_messages': 0,
-                    'their_messages': 0,
-                    'total_chars': 0,
-                    'avg_message_length': 0,
-                    'last_message_date': None
-                }
-            
-            conversations[sender]['messages'].append({
-                'text': text,
-                'is_from_me': is_from_me,
-                'date': date,
-                'char_count': len(text) if text else 0
-            })
-            
-            conversations[sender]['total_count'] += 1
-            conversations[sender]['total_chars'] += len(text) if text else 0
-            
-            if is_from_me:
-                conversations[sender]['my_messages'] += 1
-            else:
-                conversations[sender]['their_messages'] += 1
+        for sender, idxs in self._by_contact.items():
+            total_count = len(idxs)
+            my_messages = int(np.count_nonzero(self._is_from_me[idxs]))
+            total_chars = int(self._text_lens[idxs].sum())
+            last_date = int(self._dates[idxs].max())
             
-            # Track most recent message date
-            if date and (not conversations[sender]['last_message_date'] or 
-                        date > conversations[sender]['last_message_date']):
-                conversations[sender]['last_message_date'] = date
-        
-        # Calculate averages and ratios
-        for sender, conv in conversations.items():
-            if conv['total_count'] > 0:
-                conv['avg_message_length'] = conv['total_chars'] / conv['total_count']
-                conv['my_ratio'] = conv['my_messages'] / conv['total_count']
-                conv['their_ratio'] = conv['their_messages'] / conv['total_count']
+            conversations[sender] = {
+                'total_count': total_count,
+                'my_messages': my_messages,
+                'their_messages': total_count - my_messages,
+                'total_chars': total_chars,
+                'avg_message_length': total_chars / total_count,
+                'last_message_date': last_date or None,
+                'my_ratio': my_messages / total_count,
+                'their_ratio': (total_count - my_messages) / total_count
+            }
         
         return conversations
     
+    @cached_method
     def conversation_stats(self, top_n=5):
         """Generate conversation statistics"""
         conversations = self.conversation_analysis()
         if 'error' in conversations:
             return conversations
         
-        # Sort by total message count
-        sorted_convs = sorted(conversations.items(), 
-                            key=lambda x: x[1]['total_count'], 
-                            reverse=True)
+        # Select the top conversations by message count without sorting the tail
+        top_convs = nlargest(top_n, conversations.items(),
+                             key=lambda x: x[1]['total_count'])
         
         stats = {
             'total_conversations': len(conversations),
             'top_conversations': []
         }
         
-        for sender, conv in sorted_convs[:top_n]:
+        for sender, conv in top_convs:
             conv_stats = {
                 'contact': sender,
                 'total_messages': conv['total_count'],
@@ -376,6 +543,121 @@ class MessageAnalyzer:
         
         return stats 
     
+    def _build_search_index(self):
+        """Build an in-memory FTS5 trigram index over message text"""
+        # Kept in memory only - message text is never written to disk
+        conn = sqlite3.connect(':memory:', check_same_thread=False)
+        try:
+            conn.execute("CREATE VIRTUAL TABLE msg_fts USING fts5(text, tokenize='trigram')")
+        except sqlite3.OperationalError:
+            conn.close()
+            return False
+        
+        # rowid is the message's index in self.messages
+        conn.executemany(
+            "INSERT INTO msg_fts(rowid, text) VALUES (?, ?)",
+            ((i, msg.text) for i, msg in enumerate(self.messages) if msg.text)
+        )
+        return conn
+    
+    def list_contacts(self, limit=20):
+        """
+        List the most active contacts with their message counts
+        
+        Args:
+            limit (int): Maximum number of contacts to return (default: 20)
+            
+        Returns:
+            list: Contacts with message counts, most messages first
+        """
+        # Count messages by contact from the prebuilt contact index
+        contact_counts = {contact: len(idxs) for contact, idxs in self._by_contact.items()}
+        
+        # Select the most active contacts without sorting the tail
+        top_contacts = nlargest(limit, contact_counts.items(), key=lambda x: x[1])
+        
+        return [
+            {"contact": contact, "message_count": count}
+            for contact, count in top_contacts
+        ]
+    
+    def contact_statistics(self, contact):
+        """
+        Summarize messages exchanged with one contact
+        
+        Args:
+            contact (str): Formatted contact as returned by list_contacts
+            
+        Returns:
+            dict: Message counts, percentages, average length and who talks more
+        """
+        if not self.messages:
+            return {"error": "No messages loaded"}
+        
+        # Look up this contact's messages in the prebuilt contact index
+        idxs = self._by_contact.get(contact)
+        if not idxs:
+            return {"error": f"No messages found for contact: {contact}"}
+        
+        # Calculate statistics as reductions over the contact's array slice
+        total_messages = len(idxs)
+        my_messages = int(np.count_nonzero(self._is_from_me[idxs]))
+        their_messages = total_messages - my_messages
+        avg_length = float(self._text_lens[idxs].mean())
+        
+        return {
+            'contact': contact,
+            'total_messages': total_messages,
+            'my_messages': my_messages,
+            'their_messages': their_messages,
+            'my_percentage': round((my_messages / total_messages) * 100, 1),
+            'their_percentage': round((their_messages / total_messages) * 100, 1),
+            'average_message_length': round(avg_length, 1),
+            'who_talks_more': 'Me' if my_messages > their_messages else 'Them' if their_messages > my_messages else 'Equal'
+        }
+    
+    def search_messages(self, query, limit=10):
+        """
+        Search message text for a case-insensitive substring
+        
+        Args:
+            query (str): Text to search for
+            limit (int): Maximum number of results to return (default: 10)
+            
+        Returns:
+            list: Matching messages with sender, text, date and direction
+        """
+        if self._search_index is None:
+            self._search_index = self._build_search_index()
+        
+        # The trigram index can only answer queries of 3+ characters
+        if self._search_index and len(query) >= 3:
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self._search_index.execute(
+                "SELECT rowid FROM msg_fts WHERE msg_fts MATCH ? ORDER BY rowid LIMIT ?",
+                (phrase, limit)
+            )
+            matches = [self.messages[i] for (i,) in rows]
+        else:
+            query_lower = query.lower()
+            matches = []
+            for msg in self.messages:
+                text = msg.text
+                if text and query_lower in text.lower():
+                    matches.append(msg)
+                    if len(matches) >= limit:
+                        break
+        
+        return [
+            {
+                'sender': self._format_phone_number(msg.handle_id),
+                'text': msg.text,
+                'date': msg.date,
+                'is_from_me': msg.is_from_me
+            }
+            for msg in matches
+        ]
+    
     def get_conversation(self, contact, limit=100, days_back=None):
         """
         Retrieve full conversation with a specific contact
@@ -394,51 +676,55 @@ class MessageAnalyzer:
         # Normalize the contact identifier for matching
         contact_normalized = contact.lower().strip()
         
-        # Find all messages with this contact
+        # Resolve the query once against the known contacts, matching the
+        # raw handle or display form in either direction
+        matched_contacts = {
+            canonical for normalized, canonical in self._contact_norm.items()
+            if contact_normalized in normalized or normalized in contact_normalized
+        }
+        
+        # Find all messages with this contact, in original message order
         conversation_messages = []
+        indices = sorted(i for c in matched_contacts for i in self._by_contact[c])
         
-        for msg in self.messages:
-            sender = self._format_phone_number(msg.get('handle_id', 'Unknown'))
+        for i in indices:
+            msg = self.messages[i]
+            sender = self._formatted_handles[i]
             
-            # Check if this message matches the contact
-            # Try multiple matching strategies
-            matches = (
-                contact_normalized in sender.lower() or
-                contact_normalized in msg.get('handle_id', '').lower() or
-                sender.lower() in contact_normalized or
-                msg.get('handle_id', '').lower() in contact_normalized
-            )
+            message_date = msg.date
             
-            if matches:
-                message_date = msg.get('date')
-                
-                # Apply date filter if specified (skip for now since date comparison is complex with strings)
-                # if days_back and message_date:
-                #     cutoff_date = datetime.now() - timedelta(days=days_back)
-                #     if message_date < cutoff_date:
-                #         continue
-                
-                conversation_messages.append({
-                    'text': msg.get('text', '') or '',
-                    'timestamp': str(message_date) if message_date else None,
-                    'sender': 'me' if msg.get('is_from_me', False) else sender,
-                    'direction': 'sent' if msg.get('is_from_me', False) else 'received',
-                    'service': msg.get('service', 'Unknown'),
-                    'char_count': len(msg.get('text', '') or '')
-                })
+            # Apply date filter if specified (skip for now since date comparison is complex with strings)
+            # if days_back and message_date:
+            #     cutoff_date = datetime.now() - timedelta(days=days_back)
+            #     if message_date < cutoff_date:
+            #         continue
+            
+            conversation_messages.append({
+                'text': msg.text or '',
+                # Raw integer date for sorting; stringified after the limit
+                'timestamp': message_date or 0,
+                'sender': 'me' if msg.is_from_me else sender,
+                'direction': 'sent' if msg.is_from_me else 'received',
+                'service': msg.service,
+                'char_count': len(msg.text or '')
+            })
         
         if not conversation_messages:
             return {
                 "error": f"No conversation found with '{contact}'. Try a different contact name, phone number, or email address."
             }
         
-        # Sort messages chronologically (oldest first) - simple string sort should work for most timestamp formats
-        conversation_messages.sort(key=lambda x: x['timestamp'] or '1970-01-01T00:00:00')
+        # Sort messages chronologically (oldest first) on the integer date
+        conversation_messages.sort(key=itemgetter('timestamp'))
         
         # Apply limit (get most recent messages if limit exceeded)
         if len(conversation_messages) > limit:
             conversation_messages = conversation_messages[-limit:]
         
+        # Format timestamps only for the messages actually returned
+        for msg in conversation_messages:
+            msg['timestamp'] = str(msg['timestamp']) if msg['timestamp'] else None
+        
         # Calculate conversation statistics
         total_messages = len(conversation_messages)
         my_messages = sum(1 for msg in conversation_messages if msg['sender'] == 'me')
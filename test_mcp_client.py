@@ -19,6 +19,21 @@ TOOL_ARGUMENTS = {
     "get_conversation": {"contact": "+1 (630) 881-5887", "limit": 10}
 }
 
+async def list_capabilities(session):
+    """Fetch tools, resources and prompts with overlapping round-trips"""
+    if hasattr(asyncio, "TaskGroup"):  # Python 3.11+
+        async with asyncio.TaskGroup() as tg:
+            tools = tg.create_task(session.list_tools())
+            resources = tg.create_task(session.list_resources())
+            prompts = tg.create_task(session.list_prompts())
+        return tools.result(), resources.result(), prompts.result()
+    
+    return await asyncio.gather(
+        session.list_tools(),
+        session.list_resources(),
+        session.list_prompts()
+    )
+
 async def test_mcp_server():
     """Test the iMessage Analysis MCP server"""
     
@@ -38,21 +53,27 @@ async def test_mcp_server():
                 await session.initialize()
                 print("✅ Connected successfully!")
                 
-                # List available tools
-                tools = await session.list_tools()
+                # List available tools, resources and prompts
+                tools, resources, prompts = await list_capabilities(session)
                 print(f"\n📋 Available Tools ({len(tools.tools)}):")
                 for tool in tools.tools:
                     print(f"  - {tool.name}")
+                print(f"📦 Resources: {len(resources.resources)} | 💬 Prompts: {len(prompts.prompts)}")
                 
+                # Test every advertised tool concurrently over the shared session,
+                # passing mapped arguments so calls don't fail server-side validation
+                tool_names = [tool.name for tool in tools.tools]
+                results = await asyncio.gather(
+                    *(session.call_tool(name, arguments=TOOL_ARGUMENTS.get(name, {})) for name in tool_names),
+                    return_exceptions=True
+                )
                 
-                while True:
-                    tool_name = input("Please enter the exact name of the tool you want to test: ")
-                    result = await session.call_tool(tool_name, arguments={})
-                    print(result.content[0].text if result.content else "No content")
-                    if input("Do you want to test another tool? (y/n): ").lower() == "n":
-                        break
-                
-                # Test all tools a
+                for tool_name, result in zip(tool_names, results):
+                    print(f"\n🔧 {tool_name}:")
+                    if isinstance(result, Exception):
+                        print(f"  ❌ {result}")
+                    else:
+                        print(result.content[0].text if result.content else "No content")
                 
     except Exception as e:
         print(f"❌ Error: {e}")